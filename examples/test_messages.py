@@ -3,24 +3,66 @@
 Test script to verify WebSocket message format from SysMedic server.
 This script connects to the WebSocket server and validates that messages
 match the expected format.
+
+Optional:
+    pip install orjson    # faster JSON decoding of incoming frames
+                          # (ujson is used instead if only it is installed)
 """
 
 import json
+import re
 import sys
-import time
-import websocket
 import threading
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_pretty(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    try:
+        import ujson as _fallback_json
+    except ImportError:
+        _fallback_json = json
+    _json_loads = _fallback_json.loads
+
+    def _json_pretty(data):
+        return _fallback_json.dumps(data, indent=2)
+
+# Required fields per message type, checked with a single subset test on
+# the happy path; the ordered tuples are only walked to report a failure
+WELCOME_FIELDS = ('message', 'version', 'system', 'status', 'daemon')
+SYSTEM_UPDATE_FIELDS = ('cpu_usage', 'memory_usage', 'disk_usage', 'uptime')
+PERCENT_FIELDS = ('cpu_usage', 'memory_usage', 'disk_usage')
+
+_WELCOME_KEYS = frozenset(WELCOME_FIELDS)
+_SYSTEM_UPDATE_KEYS = frozenset(SYSTEM_UPDATE_FIELDS)
+
+# ISO 8601 date and time prefix, e.g. 2024-01-02T15:04:05Z
+_TIMESTAMP_RE = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+
+
+def _first_missing(fields, data):
+    """Return the first field from fields that is absent in data"""
+    for field in fields:
+        if field not in data:
+            return field
+    return None
+
 class MessageFormatTester:
-    def __init__(self, url, secret):
+    def __init__(self, url, secret, verbose=False, target_updates=3):
         self.url = url
         self.secret = secret
+        self.verbose = verbose
+        self.target_updates = target_updates
         self.ws_url = f"{url}?secret={secret}"
         self.ws = None
         self.connected = False
-        self.messages_received = []
+        self.messages_received = 0
         self.welcome_received = False
         self.system_updates_received = 0
+        self.done = threading.Event()
 
     def on_open(self, ws):
         print("✅ Connected to WebSocket server")
@@ -28,19 +70,20 @@ class MessageFormatTester:
 
     def on_message(self, ws, message):
         try:
-            data = json.loads(message)
-            self.messages_received.append(data)
+            data = _json_loads(message)
+            self.messages_received += 1
 
-            print(f"\n📨 Message received:")
-            print(f"Raw: {message}")
-            print(f"Parsed: {json.dumps(data, indent=2)}")
+            if self.verbose:
+                print(f"\n📨 Message received:\n"
+                      f"Raw: {message.decode(errors='replace')}\n"
+                      f"Parsed: {_json_pretty(data)}")
 
             # Validate message format
             self.validate_message(data)
 
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             print(f"❌ Invalid JSON: {e}")
-            print(f"Raw message: {message}")
+            print(f"Raw message: {message.decode(errors='replace')}")
 
     def on_error(self, ws, error):
         print(f"❌ WebSocket error: {error}")
@@ -79,18 +122,6 @@ class MessageFormatTester:
         """Validate welcome message format"""
         print("🎉 Validating welcome message...")
 
-        expected_structure = {
-            "type": "welcome",
-            "data": {
-                "message": "Connected to SysMedic",
-                "version": "1.0.5",
-                "system": str,  # e.g., "Ubuntu 22.04.5 LTS"
-                "status": str,  # e.g., "Light Usage"
-                "daemon": "Running"
-            },
-            "timestamp": str  # ISO format
-        }
-
         # Check data field exists
         if 'data' not in data:
             print("❌ Welcome message missing 'data' field")
@@ -99,11 +130,9 @@ class MessageFormatTester:
         welcome_data = data['data']
 
         # Check required fields
-        required_fields = ['message', 'version', 'system', 'status', 'daemon']
-        for field in required_fields:
-            if field not in welcome_data:
-                print(f"❌ Welcome data missing '{field}' field")
-                return False
+        if not _WELCOME_KEYS.issubset(welcome_data):
+            print(f"❌ Welcome data missing '{_first_missing(WELCOME_FIELDS, welcome_data)}' field")
+            return False
 
         # Validate specific values
         if welcome_data['message'] != "Connected to SysMedic":
@@ -116,17 +145,17 @@ class MessageFormatTester:
 
         # Check timestamp format (should be ISO format)
         timestamp = data['timestamp']
-        if not isinstance(timestamp, str) or 'T' not in timestamp:
+        if not isinstance(timestamp, str) or not _TIMESTAMP_RE.match(timestamp):
             print(f"❌ Invalid timestamp format: {timestamp}")
             return False
 
-        print("✅ Welcome message format is correct!")
-        print(f"   Message: {welcome_data['message']}")
-        print(f"   Version: {welcome_data['version']}")
-        print(f"   System: {welcome_data['system']}")
-        print(f"   Status: {welcome_data['status']}")
-        print(f"   Daemon: {welcome_data['daemon']}")
-        print(f"   Timestamp: {timestamp}")
+        print("✅ Welcome message format is correct!\n"
+              f"   Message: {welcome_data['message']}\n"
+              f"   Version: {welcome_data['version']}\n"
+              f"   System: {welcome_data['system']}\n"
+              f"   Status: {welcome_data['status']}\n"
+              f"   Daemon: {welcome_data['daemon']}\n"
+              f"   Timestamp: {timestamp}")
 
         self.welcome_received = True
         return True
@@ -143,55 +172,79 @@ class MessageFormatTester:
         update_data = data['data']
 
         # Check required fields
-        required_fields = ['cpu_usage', 'memory_usage', 'disk_usage', 'uptime']
-        for field in required_fields:
-            if field not in update_data:
-                print(f"❌ System update missing '{field}' field")
-                return False
-
-        # Validate data types
-        if not isinstance(update_data['cpu_usage'], (int, float)):
-            print(f"❌ cpu_usage should be numeric, got: {type(update_data['cpu_usage'])}")
-            return False
-
-        if not isinstance(update_data['memory_usage'], (int, float)):
-            print(f"❌ memory_usage should be numeric, got: {type(update_data['memory_usage'])}")
+        if not _SYSTEM_UPDATE_KEYS.issubset(update_data):
+            print(f"❌ System update missing '{_first_missing(SYSTEM_UPDATE_FIELDS, update_data)}' field")
             return False
 
-        if not isinstance(update_data['disk_usage'], (int, float)):
-            print(f"❌ disk_usage should be numeric, got: {type(update_data['disk_usage'])}")
-            return False
+        # Validate data types and ranges (should be 0-100 for percentages)
+        for field in PERCENT_FIELDS:
+            value = update_data[field]
+            if not isinstance(value, (int, float)):
+                print(f"❌ {field} should be numeric, got: {type(value)}")
+                return False
+            if not (0 <= value <= 100):
+                print(f"⚠️ {field} seems unusual: {value}% (should be 0-100)")
 
         if not isinstance(update_data['uptime'], str):
             print(f"❌ uptime should be string, got: {type(update_data['uptime'])}")
             return False
 
-        # Validate ranges (should be 0-100 for percentages)
-        for field in ['cpu_usage', 'memory_usage', 'disk_usage']:
-            value = update_data[field]
-            if not (0 <= value <= 100):
-                print(f"⚠️ {field} seems unusual: {value}% (should be 0-100)")
-
         # Check timestamp format
         timestamp = data['timestamp']
-        if not isinstance(timestamp, str) or 'T' not in timestamp:
+        if not isinstance(timestamp, str) or not _TIMESTAMP_RE.match(timestamp):
             print(f"❌ Invalid timestamp format: {timestamp}")
             return False
 
-        print("✅ System update message format is correct!")
-        print(f"   CPU: {update_data['cpu_usage']}%")
-        print(f"   Memory: {update_data['memory_usage']}%")
-        print(f"   Disk: {update_data['disk_usage']}%")
-        print(f"   Uptime: {update_data['uptime']}")
-        print(f"   Timestamp: {timestamp}")
+        print("✅ System update message format is correct!\n"
+              f"   CPU: {update_data['cpu_usage']}%\n"
+              f"   Memory: {update_data['memory_usage']}%\n"
+              f"   Disk: {update_data['disk_usage']}%\n"
+              f"   Uptime: {update_data['uptime']}\n"
+              f"   Timestamp: {timestamp}")
 
         self.system_updates_received += 1
+        if self.welcome_received and self.system_updates_received >= self.target_updates:
+            self.done.set()
+        return True
+
+    def validate_batch(self, updates):
+        """Check the percentage fields of many system update payloads at once
+
+        Returns one boolean per update: True when cpu, memory and disk usage
+        are all finite numbers within 0-100. Uses numpy when available.
+        """
+        if not updates:
+            return []
+
+        try:
+            import numpy as np
+        except ImportError:
+            return [self._percentages_valid(update) for update in updates]
+
+        values = np.array([[update.get(field) for field in PERCENT_FIELDS] for update in updates])
+        if values.dtype.kind not in 'biuf':
+            # Missing or non-numeric fields; let the scalar check sort them out
+            return [self._percentages_valid(update) for update in updates]
+
+        values = values.astype(np.float64)
+        valid = np.isfinite(values).all(axis=1) & ((values >= 0) & (values <= 100)).all(axis=1)
+        return valid.tolist()
+
+    def _percentages_valid(self, update):
+        """Scalar fallback for validate_batch"""
+        for field in PERCENT_FIELDS:
+            value = update.get(field)
+            if not isinstance(value, (int, float)) or not (0 <= value <= 100):
+                return False
         return True
 
     def connect_and_test(self, test_duration=10):
-        """Connect and test for specified duration"""
+        """Connect and test until enough updates arrive or the duration expires"""
         print(f"🔄 Connecting to {self.ws_url}")
 
+        # Imported here so the usage message does not load websocket-client
+        import websocket
+
         # Enable debug for troubleshooting
         # websocket.enableTrace(True)
 
@@ -203,20 +256,24 @@ class MessageFormatTester:
             on_close=self.on_close
         )
 
-        # Start WebSocket in a separate thread
-        ws_thread = threading.Thread(target=self.ws.run_forever, daemon=True)
+        # Start WebSocket in a separate thread; frames arrive as bytes
+        ws_thread = threading.Thread(
+            target=self.ws.run_forever,
+            kwargs={'skip_utf8_validation': True},
+            daemon=True
+        )
         ws_thread.start()
 
         # Wait for connection and messages
-        print(f"⏱️ Testing for {test_duration} seconds...")
-        time.sleep(test_duration)
+        print(f"⏱️ Testing for up to {test_duration} seconds...")
+        self.done.wait(timeout=test_duration)
 
         # Close connection
         if self.ws:
             self.ws.close()
 
         # Wait for thread to finish
-        time.sleep(1)
+        ws_thread.join(timeout=1)
 
         # Report results
         self.print_test_results()
@@ -227,7 +284,7 @@ class MessageFormatTester:
         print("📋 TEST RESULTS SUMMARY")
         print("="*50)
 
-        print(f"Total messages received: {len(self.messages_received)}")
+        print(f"Total messages received: {self.messages_received}")
         print(f"Welcome message received: {'✅ Yes' if self.welcome_received else '❌ No'}")
         print(f"System updates received: {self.system_updates_received}")
 
@@ -250,13 +307,16 @@ class MessageFormatTester:
 
 
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python test_messages.py <ws_url> <secret>")
+    args = [arg for arg in sys.argv[1:] if arg not in ('-v', '--verbose')]
+    verbose = len(args) != len(sys.argv) - 1
+
+    if len(args) != 2:
+        print("Usage: python test_messages.py [--verbose] <ws_url> <secret>")
         print("Example: python test_messages.py ws://45.95.186.208:8060/ws 55625821f7a0a9db98707bae107e46a4")
         sys.exit(1)
 
-    url = sys.argv[1]
-    secret = sys.argv[2]
+    url = args[0]
+    secret = args[1]
 
     print("🧪 SysMedic WebSocket Message Format Tester")
     print("=" * 45)
@@ -264,10 +324,11 @@ def main():
     print(f"Secret: {secret[:8]}...")
     print()
 
-    tester = MessageFormatTester(url, secret)
+    tester = MessageFormatTester(url, secret, verbose=verbose)
 
     try:
-        # Test for 15 seconds to get multiple system updates
+        # Stop once the welcome and target_updates system updates are
+        # validated, or after 15 seconds at most
         tester.connect_and_test(test_duration=15)
 
     except KeyboardInterrupt:
@@ -9,6 +9,14 @@ connection handling, automatic reconnection, and ping/pong monitoring.
 Requirements:
     pip install websocket-client
 
+Optional:
+    pip install orjson    # faster JSON encode/decode on the message path
+                          # (ujson is used instead if only it is installed)
+    pip install wsaccel   # C masking of the frames this client sends; inbound
+                          # frames are unmasked and skip UTF-8 validation,
+                          # so it does not speed up receiving
+    pip install pyyaml    # parse the config message (uses libyaml if built with it)
+
 Usage:
     python websocket_client.py ws://hostname:port/ws secret
     or
@@ -19,11 +27,24 @@ import sys
 import json
 import time
 import signal
+import random
+import itertools
 import threading
 import logging
-from urllib.parse import urlparse, urlencode
 import websocket
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    try:
+        import ujson as _fallback_json
+    except ImportError:
+        _fallback_json = json
+    _json_loads = _fallback_json.loads
+    _json_dumps = _fallback_json.dumps
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,7 +52,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+def _load_yaml(data):
+    """Parse YAML with the libyaml-backed loader when it is available"""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(data, Loader=loader)
+
 class SysMedicClient:
+    # Pre-encoded request envelopes; only the sequence number varies per call
+    _PING_REQUEST = b'{"type":"ping","request_id":"ping_'
+    _MANUAL_PING_REQUEST = b'{"type":"ping","request_id":"manual_ping_'
+    _SYSINFO_REQUEST = b'{"type":"get_system_info","request_id":"sysinfo_'
+    _ALERTS_REQUEST = b'{"type":"get_alerts","request_id":"alerts_'
+    _USER_METRICS_REQUEST = b'{"type":"get_user_metrics","request_id":"usermetrics_'
+    _CONFIG_REQUEST = b'{"type":"get_config","request_id":"config_'
+
     def __init__(self, url, secret, **options):
         self.url = url
         self.secret = secret
@@ -44,13 +80,20 @@ class SysMedicClient:
         self.ping_interval = options.get('ping_interval', 30)
         self.pong_timeout = options.get('pong_timeout', 10)
 
-        self.last_pong = time.time()
-        self.ping_timer = None
-        self.pong_timer = None
+        # Reconnect delays grow by 1.5x per attempt, capped at 30 seconds
+        self.reconnect_delays = [
+            min(self.reconnect_interval * (1.5 ** attempt), 30)
+            for attempt in range(self.max_reconnect_attempts)
+        ]
+
+        self.last_pong = time.monotonic()
+        self.monitor_stop = None
+        self.monitor_thread = None
         self.reconnect_timer = None
 
         self.metrics = {}
         self.message_count = 0
+        self._seq = itertools.count(1)
 
         # Event callbacks
         self.on_connect = options.get('on_connect', lambda: None)
@@ -62,6 +105,16 @@ class SysMedicClient:
         # Build WebSocket URL with secret
         self.ws_url = f"{self.url}?secret={self.secret}"
 
+        # WebSocketApp callbacks, bound once and reused on every reconnect
+        self._ws_callbacks = dict(
+            on_open=self._on_open,
+            on_message=self._on_message,
+            on_error=self._on_error,
+            on_close=self._on_close,
+            on_ping=self._on_ping,
+            on_pong=self._on_pong
+        )
+
         # Auto-connect if not disabled
         if options.get('auto_connect', True):
             self.connect()
@@ -78,18 +131,16 @@ class SysMedicClient:
             websocket.enableTrace(False)
 
             # Create WebSocket connection
-            self.ws = websocket.WebSocketApp(
-                self.ws_url,
-                on_open=self._on_open,
-                on_message=self._on_message,
-                on_error=self._on_error,
-                on_close=self._on_close,
-                on_ping=self._on_ping,
-                on_pong=self._on_pong
-            )
+            self.ws = websocket.WebSocketApp(self.ws_url, **self._ws_callbacks)
+
+            # Skip websocket-client's pure-Python UTF-8 check and decode: text
+            # frames reach on_message as bytes and the JSON parser validates them
+            run_options = {'skip_utf8_validation': True}
 
             # Start the WebSocket connection in a separate thread
-            self.ws_thread = threading.Thread(target=self.ws.run_forever, daemon=True)
+            self.ws_thread = threading.Thread(
+                target=self.ws.run_forever, kwargs=run_options, daemon=True
+            )
             self.ws_thread.start()
 
         except Exception as error:
@@ -101,7 +152,7 @@ class SysMedicClient:
         logger.info("WebSocket connection established")
         self.connected = True
         self.reconnect_attempts = 0
-        self.last_pong = time.time()
+        self.last_pong = time.monotonic()
 
         # Start ping monitoring
         self.start_ping_monitoring()
@@ -116,82 +167,91 @@ class SysMedicClient:
     def _on_message(self, ws, message):
         """Called when a message is received"""
         try:
-            data = json.loads(message)
+            data = _json_loads(message)
             self.message_count += 1
 
             # Handle different message types
-            msg_type = data.get('type', 'unknown')
+            get = data.get
+            msg_type = get('type', 'unknown')
 
-            if msg_type == 'welcome':
-                welcome_data = data.get('data', {})
-                logger.info(f"Received welcome: {welcome_data.get('message', 'N/A')}")
-                logger.info(f"Server version: {welcome_data.get('version', 'Unknown')}")
-                logger.info(f"System: {welcome_data.get('system', 'Unknown')}")
-                logger.info(f"Status: {welcome_data.get('status', 'Unknown')}")
-                logger.info(f"Daemon: {welcome_data.get('daemon', 'Unknown')}")
-
-            elif msg_type == 'config':
-                config_data = data.get('data', '')
-                logger.info("📋 Configuration received:")
-                logger.info(f"Config data length: {len(config_data)} characters")
-
-                # Try to parse and display key configuration values
-                try:
-                    import yaml
-                    config_parsed = yaml.safe_load(config_data)
-                    if isinstance(config_parsed, dict):
-                        logger.info("✅ Configuration is valid YAML")
-
-                        # Display key monitoring settings
-                        if 'monitoring' in config_parsed:
-                            monitoring = config_parsed['monitoring']
-                            logger.info(f"🔧 Monitoring Settings:")
-                            logger.info(f"   CPU Threshold: {monitoring.get('cpu_threshold', 'N/A')}%")
-                            logger.info(f"   Memory Threshold: {monitoring.get('memory_threshold', 'N/A')}%")
-                            logger.info(f"   Check Interval: {monitoring.get('check_interval', 'N/A')}s")
-
-                        # Display WebSocket settings
-                        if 'websocket' in config_parsed:
-                            websocket_config = config_parsed['websocket']
-                            logger.info(f"🌐 WebSocket Settings:")
-                            logger.info(f"   Port: {websocket_config.get('port', 'N/A')}")
-                            logger.info(f"   Enabled: {websocket_config.get('enabled', 'N/A')}")
-
-                        # Display user thresholds if any
-                        if 'user_thresholds' in config_parsed and config_parsed['user_thresholds']:
-                            logger.info(f"👥 Custom User Thresholds: {len(config_parsed['user_thresholds'])} users configured")
-                    else:
-                        logger.warning("❌ Config data is not a valid dictionary")
-
-                except ImportError:
-                    logger.warning("⚠️  PyYAML not available, displaying raw config")
-                    logger.info(f"Raw config (first 300 chars): {config_data[:300]}...")
-                except Exception as e:
-                    logger.error(f"❌ Failed to parse config YAML: {e}")
-                    logger.info(f"Raw config (first 300 chars): {config_data[:300]}...")
-
-            elif msg_type == 'system_update':
-                self.metrics = data.get('data', {})
+            # Ordered by frequency: updates and pongs make up the steady stream
+            if msg_type == 'system_update':
+                self.metrics = get('data', {})
                 self._log_metrics()
 
             elif msg_type == 'pong':
-                self.last_pong = time.time()
+                self.last_pong = time.monotonic()
                 logger.debug("Pong received")
 
+            elif msg_type == 'welcome':
+                welcome_data = get('data', {})
+                logger.info("Received welcome: %s", welcome_data.get('message', 'N/A'))
+                logger.info("Server version: %s", welcome_data.get('version', 'Unknown'))
+                logger.info("System: %s", welcome_data.get('system', 'Unknown'))
+                logger.info("Status: %s", welcome_data.get('status', 'Unknown'))
+                logger.info("Daemon: %s", welcome_data.get('daemon', 'Unknown'))
+
+            elif msg_type == 'config':
+                # The config is only parsed to be displayed
+                if logger.isEnabledFor(logging.INFO):
+                    self._log_config(get('data', ''))
+
             elif msg_type == 'alert':
-                alert_data = data.get('data', {})
-                logger.warning(f"Alert received: {alert_data}")
+                alert_data = get('data', {})
+                logger.warning("Alert received: %s", alert_data)
 
             else:
-                logger.info(f"Unknown message type: {msg_type}")
+                logger.info("Unknown message type: %s", msg_type)
 
             self.on_message(data)
 
-        except json.JSONDecodeError as error:
+        except ValueError as error:
             logger.error(f"Failed to parse message: {error}")
         except Exception as error:
             logger.error(f"Error handling message: {error}")
 
+    def _log_config(self, config_data):
+        """Log key values from a config message"""
+        logger.info("📋 Configuration received:")
+        logger.info("Config data length: %d characters", len(config_data))
+
+        # Parse the YAML once; only the failure paths look at the raw text
+        try:
+            config_parsed = _load_yaml(config_data)
+        except ImportError:
+            logger.warning("⚠️  PyYAML not available, displaying raw config")
+            logger.info("Raw config (first 300 chars): %s...", config_data[:300])
+            return
+        except Exception as e:
+            logger.error("❌ Failed to parse config YAML: %s", e)
+            logger.info("Raw config (first 300 chars): %s...", config_data[:300])
+            return
+
+        if not isinstance(config_parsed, dict):
+            logger.warning("❌ Config data is not a valid dictionary")
+            return
+
+        logger.info("✅ Configuration is valid YAML")
+
+        # Display key monitoring settings
+        if 'monitoring' in config_parsed:
+            monitoring = config_parsed['monitoring']
+            logger.info("🔧 Monitoring Settings:")
+            logger.info("   CPU Threshold: %s%%", monitoring.get('cpu_threshold', 'N/A'))
+            logger.info("   Memory Threshold: %s%%", monitoring.get('memory_threshold', 'N/A'))
+            logger.info("   Check Interval: %ss", monitoring.get('check_interval', 'N/A'))
+
+        # Display WebSocket settings
+        if 'websocket' in config_parsed:
+            websocket_config = config_parsed['websocket']
+            logger.info("🌐 WebSocket Settings:")
+            logger.info("   Port: %s", websocket_config.get('port', 'N/A'))
+            logger.info("   Enabled: %s", websocket_config.get('enabled', 'N/A'))
+
+        # Display user thresholds if any
+        if config_parsed.get('user_thresholds'):
+            logger.info("👥 Custom User Thresholds: %d users configured", len(config_parsed['user_thresholds']))
+
     def _on_error(self, ws, error):
         """Called when an error occurs"""
         logger.error(f"WebSocket error: {error}")
@@ -214,41 +274,43 @@ class SysMedicClient:
 
     def _on_pong(self, ws, message):
         """Called when a pong is received"""
-        self.last_pong = time.time()
+        self.last_pong = time.monotonic()
         logger.debug("Pong received")
 
     def start_ping_monitoring(self):
-        """Start ping/pong monitoring timers"""
-        # Send ping every ping_interval seconds
-        def send_ping():
-            if self.connected and self.ws:
-                try:
-                    self.send_message({
-                        'type': 'ping',
-                        'request_id': f'ping_{int(time.time())}'
-                    })
-                    logger.debug("Ping sent")
-                except Exception as error:
-                    logger.error(f"Failed to send ping: {error}")
-
-            if self.connected:
-                self.ping_timer = threading.Timer(self.ping_interval, send_ping)
-                self.ping_timer.start()
-
-        # Check for pong timeout
-        def check_pong_timeout():
-            if self.connected:
-                time_since_pong = time.time() - self.last_pong
-                if time_since_pong > self.pong_timeout + self.ping_interval:
-                    logger.warning("Pong timeout detected, reconnecting...")
-                    self.reconnect()
-                else:
-                    self.pong_timer = threading.Timer(self.pong_timeout, check_pong_timeout)
-                    self.pong_timer.start()
-
-        # Start timers
-        send_ping()
-        check_pong_timeout()
+        """Start the ping/pong monitor thread for the current connection"""
+        self.monitor_stop = threading.Event()
+        self.monitor_thread = threading.Thread(
+            target=self._monitor_loop, args=(self.monitor_stop,), daemon=True
+        )
+        self.monitor_thread.start()
+
+    def send_ping(self):
+        """Send an application-level ping to the server"""
+        if self.connected and self.ws:
+            try:
+                self._send_request(self._PING_REQUEST)
+                logger.debug("Ping sent")
+            except Exception as error:
+                logger.error(f"Failed to send ping: {error}")
+
+    def _monitor_loop(self, stop):
+        """Send pings and check for pong timeouts until stopped"""
+        next_ping = time.monotonic()
+        while self.connected and not stop.is_set():
+            now = time.monotonic()
+            if now >= next_ping:
+                self.send_ping()
+                next_ping = now + self.ping_interval
+
+            time_since_pong = now - self.last_pong
+            if time_since_pong > self.pong_timeout + self.ping_interval:
+                logger.warning("Pong timeout detected, reconnecting...")
+                self.reconnect()
+                return
+
+            # Wake up for the next ping or pong check, whichever comes first
+            stop.wait(min(self.pong_timeout, next_ping - now))
 
     def schedule_reconnect(self):
         """Schedule automatic reconnection"""
@@ -257,7 +319,8 @@ class SysMedicClient:
             return
 
         self.reconnect_attempts += 1
-        delay = min(self.reconnect_interval * (1.5 ** (self.reconnect_attempts - 1)), 30)
+        # Jitter keeps many clients from reconnecting in lockstep
+        delay = self.reconnect_delays[self.reconnect_attempts - 1] + random.uniform(0, 1)
 
         logger.info(f"Scheduling reconnection attempt {self.reconnect_attempts}/{self.max_reconnect_attempts} in {delay:.1f}s")
 
@@ -274,10 +337,18 @@ class SysMedicClient:
 
     def send_message(self, data):
         """Send a message to the server"""
+        return self._send_raw(_json_dumps(data))
+
+    def _send_request(self, template):
+        """Send a pre-encoded request envelope with the next request ID"""
+        return self._send_raw(template + str(next(self._seq)).encode() + b'"}')
+
+    def _send_raw(self, payload):
+        """Send an already encoded JSON payload as a text frame"""
         if self.connected and self.ws:
             try:
-                message = json.dumps(data)
-                self.ws.send(message)
+                # orjson emits UTF-8 bytes; send them as a text frame as-is
+                self.ws.send(payload, websocket.ABNF.OPCODE_TEXT)
                 return True
             except Exception as error:
                 logger.error(f"Failed to send message: {error}")
@@ -286,43 +357,48 @@ class SysMedicClient:
             logger.warning("Cannot send message: not connected")
             return False
 
+    def send_batch(self, messages):
+        """Send several messages to the server with a single socket write"""
+        if self.connected and self.ws and self.ws.sock:
+            try:
+                # The server reads one request per frame, so keep one frame
+                # per message but hand all of them to the kernel at once
+                frames = b''.join(
+                    websocket.ABNF.create_frame(_json_dumps(data), websocket.ABNF.OPCODE_TEXT).format()
+                    for data in messages
+                )
+                with self.ws.sock.lock:
+                    self.ws.sock.sock.sendall(frames)
+                return True
+            except Exception as error:
+                logger.error(f"Failed to send messages: {error}")
+                return False
+        else:
+            logger.warning("Cannot send messages: not connected")
+            return False
+
     def request_system_info(self):
         """Request system information from server"""
-        return self.send_message({
-            'type': 'get_system_info',
-            'request_id': f'sysinfo_{int(time.time())}'
-        })
+        return self._send_request(self._SYSINFO_REQUEST)
 
     def request_alerts(self):
         """Request alerts from server"""
-        return self.send_message({
-            'type': 'get_alerts',
-            'request_id': f'alerts_{int(time.time())}'
-        })
+        return self._send_request(self._ALERTS_REQUEST)
 
     def request_user_metrics(self):
         """Request user metrics from server"""
-        return self.send_message({
-            'type': 'get_user_metrics',
-            'request_id': f'usermetrics_{int(time.time())}'
-        })
+        return self._send_request(self._USER_METRICS_REQUEST)
 
     def request_config(self):
         """Request configuration from server"""
-        return self.send_message({
-            'type': 'get_config',
-            'request_id': f'config_{int(time.time())}'
-        })
+        return self._send_request(self._CONFIG_REQUEST)
 
     def cleanup(self):
-        """Clean up timers and connections"""
-        if self.ping_timer:
-            self.ping_timer.cancel()
-            self.ping_timer = None
-
-        if self.pong_timer:
-            self.pong_timer.cancel()
-            self.pong_timer = None
+        """Clean up the ping monitor and connections"""
+        if self.monitor_stop:
+            self.monitor_stop.set()
+            self.monitor_stop = None
+        self.monitor_thread = None
 
         if self.ws:
             try:
@@ -349,20 +425,22 @@ class SysMedicClient:
         return {
             'connected': self.connected,
             'reconnect_attempts': self.reconnect_attempts,
-            'last_pong': self.last_pong,
+            # last_pong is tracked on the monotonic clock; report wall time
+            'last_pong': time.time() - (time.monotonic() - self.last_pong),
             'message_count': self.message_count,
             'metrics': self.metrics
         }
 
     def _log_metrics(self):
         """Log current system metrics"""
-        if self.metrics:
-            cpu = self.metrics.get('cpu_usage', 0)
-            memory = self.metrics.get('memory_usage', 0)
-            disk = self.metrics.get('disk_usage', 0)
-            uptime = self.metrics.get('uptime', 'Unknown')
+        if self.metrics and logger.isEnabledFor(logging.INFO):
+            get = self.metrics.get
+            cpu = get('cpu_usage', 0)
+            memory = get('memory_usage', 0)
+            disk = get('disk_usage', 0)
+            uptime = get('uptime', 'Unknown')
 
-            logger.info(f"📊 System Metrics - CPU: {cpu:.1f}%, Memory: {memory:.1f}%, Disk: {disk:.1f}%, Uptime: {uptime}")
+            logger.info("📊 System Metrics - CPU: %.1f%%, Memory: %.1f%%, Disk: %.1f%%, Uptime: %s", cpu, memory, disk, uptime)
 
     def run_interactive(self):
         """Run interactive command loop"""
@@ -395,7 +473,7 @@ class SysMedicClient:
                     elif command == 'config':
                         self.request_config()
                     elif command == 'ping':
-                        self.send_message({'type': 'ping', 'request_id': f'manual_ping_{int(time.time())}'})
+                        self._send_request(self._MANUAL_PING_REQUEST)
                     elif command:
                         logger.warning(f"Unknown command: {command}")
 
@@ -8,39 +8,122 @@ and request specific information from the server.
 Requirements:
     pip install websocket-client
 
+Optional:
+    pip install orjson    # faster JSON encode/decode on the message path
+                          # (ujson is used instead if only it is installed)
+    pip install wsaccel   # C masking of the frames this client sends; inbound
+                          # frames are unmasked and skip UTF-8 validation,
+                          # so it does not speed up receiving
+
 Usage:
     python websocket_client_interactive.py sysmedic://secret@hostname:port/
 """
 
+import os
 import sys
 import json
 import time
 import signal
+import operator
+import selectors
 import threading
-import uuid
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 import websocket
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    try:
+        import ujson as _fallback_json
+    except ImportError:
+        _fallback_json = json
+    _json_loads = _fallback_json.loads
+
+    def _json_dumps(obj):
+        return _fallback_json.dumps(obj).encode()
+
+_decoder = json.JSONDecoder()
+
+# Fields displayed for alerts responses, with defaults
+_ALERT_DEFAULTS = {'unresolved_count': 0, 'total_count': 0, 'status': 'Unknown', 'recent_alerts': []}
+_alert_fields = operator.itemgetter(*_ALERT_DEFAULTS)
+
+
+def _iter_documents(payload):
+    """Yield each JSON document from a frame holding several of them
+
+    Documents may be separated by whitespace or commas. Raises
+    ValueError if any of them is malformed or not valid UTF-8.
+    """
+    if isinstance(payload, bytes):
+        payload = payload.decode()
+
+    pos, end = 0, len(payload)
+    while True:
+        while pos < end and payload[pos] in ' \t\r\n,':
+            pos += 1
+        if pos == end:
+            return
+        document, pos = _decoder.raw_decode(payload, pos)
+        yield document
+
 class SysMedicInteractiveClient:
+    # Buffered system update lines are written out this long after the
+    # first line of a burst arrives
+    OUTPUT_FLUSH_INTERVAL = 0.05
+
+    # Unanswered requests are forgotten after this many seconds
+    PENDING_REQUEST_TTL = 60
+
+    # Requests issued by the interactive commands
+    REQUEST_TYPES = ('get_system_info', 'get_alerts', 'get_user_metrics',
+                     'get_config', 'get_uptime', 'ping')
+
+    # Compact system update line: time, then value and bar per metric, uptime
+    _UPDATE_LINE = "📊 [%s] CPU: %5.1f%% %s | Memory: %5.1f%% %s | Disk: %5.1f%% %s | Uptime: %s\n"
+
+    # Default-width progress bars, indexed by the number of filled cells
+    _BARS = tuple(f"[{'█' * filled}{'░' * (10 - filled)}]" for filled in range(11))
+
     def __init__(self, connection_url):
         self.connection_url = connection_url
         self.ws = None
         self.running = False
         self.pending_requests = {}
         self.request_counter = 0
+        self._out_buf = []
+        # Held while appending to or swapping and writing _out_buf; updates
+        # arrive on the receive thread, flushes also come from the main thread
+        self._out_lock = threading.Lock()
+        self._clock_second = 0
+        self._clock_text = ''
+        self._stdin_buf = b''
+        self._connect_done = threading.Event()
+        # Encoded request prefixes, filled up front for the built-in commands
+        self._request_prefixes = {}
+        for request_type in self.REQUEST_TYPES:
+            self._request_prefix(request_type)
+
+        # Handlers for unsolicited messages, keyed by message type
+        self._handlers = {
+            'system_update': self.display_system_update,
+            'welcome': self.display_welcome,
+            'alert': self.display_alert,
+            'error': self.display_error,
+        }
 
         # Parse the connection URL
         self.parse_url(connection_url)
 
     def parse_url(self, url):
         """Parse sysmedic://secret@host:port/ URL format"""
-        if not url.startswith('sysmedic://'):
+        # urlsplit handles the netloc of any scheme, no http:// rewrite needed
+        parsed = urlsplit(url)
+        if parsed.scheme != 'sysmedic':
             raise ValueError("URL must start with 'sysmedic://'")
 
-        # Replace sysmedic:// with http:// for parsing
-        http_url = url.replace('sysmedic://', 'http://')
-        parsed = urlparse(http_url)
-
         if not parsed.username or not parsed.hostname or not parsed.port:
             raise ValueError("Invalid URL format. Expected: sysmedic://secret@host:port/")
 
@@ -57,7 +140,7 @@ class SysMedicInteractiveClient:
     def generate_request_id(self):
         """Generate unique request ID"""
         self.request_counter += 1
-        return f"req_{self.request_counter}_{int(time.time())}"
+        return self.request_counter
 
     def send_request(self, request_type, data=None):
         """Send a request to the server"""
@@ -66,14 +149,14 @@ class SysMedicInteractiveClient:
             return None
 
         request_id = self.generate_request_id()
-        request = {
-            "type": request_type,
-            "request_id": request_id,
-            "data": data
-        }
+
+        # Every 32 requests, drop those the server never answered
+        if request_id & 0x1F == 0:
+            self.prune_pending_requests()
 
         try:
-            self.ws.send(json.dumps(request))
+            self.ws.send(self._encode_request(request_type, request_id, data),
+                         websocket.ABNF.OPCODE_TEXT)
             self.pending_requests[request_id] = {
                 "type": request_type,
                 "timestamp": time.time()
@@ -84,13 +167,78 @@ class SysMedicInteractiveClient:
             print(f"❌ Error sending request: {e}")
             return None
 
+    def send_requests(self, request_types):
+        """Send several requests to the server with a single socket write"""
+        if not self.ws or not self.running or not self.ws.sock:
+            print("❌ Cannot send requests: Not connected to server")
+            return []
+
+        request_ids = [self.generate_request_id() for _ in request_types]
+
+        try:
+            # One frame per request (the server reads one each), one write
+            frames = b''.join(
+                websocket.ABNF.create_frame(
+                    self._encode_request(request_type, request_id, None),
+                    websocket.ABNF.OPCODE_TEXT
+                ).format()
+                for request_type, request_id in zip(request_types, request_ids)
+            )
+            with self.ws.sock.lock:
+                self.ws.sock.sock.sendall(frames)
+        except Exception as e:
+            print(f"❌ Error sending requests: {e}")
+            return []
+
+        now = time.time()
+        for request_type, request_id in zip(request_types, request_ids):
+            self.pending_requests[request_id] = {
+                "type": request_type,
+                "timestamp": now
+            }
+        print(f"📤 Sent {len(request_ids)} requests: {', '.join(request_types)}")
+        return request_ids
+
+    def prune_pending_requests(self):
+        """Forget pending requests older than PENDING_REQUEST_TTL"""
+        cutoff = time.time() - self.PENDING_REQUEST_TTL
+        # Snapshot first: responses pop entries from the receive thread
+        for request_id, request_info in list(self.pending_requests.items()):
+            if request_info['timestamp'] < cutoff:
+                self.pending_requests.pop(request_id, None)
+
+    def _encode_request(self, request_type, request_id, data):
+        """Encode a request as UTF-8 JSON, reusing the encoded prefix per type"""
+        prefix = self._request_prefixes.get(request_type) or self._request_prefix(request_type)
+        if data is None:
+            return prefix + str(request_id).encode() + b'","data":null}'
+        return prefix + str(request_id).encode() + b'","data":' + _json_dumps(data) + b'}'
+
+    def _request_prefix(self, request_type):
+        """Encode and cache the part of a request that precedes its ID"""
+        prefix = b'{"type":' + _json_dumps(request_type) + b',"request_id":"'
+        self._request_prefixes[request_type] = prefix
+        return prefix
+
     def on_message(self, ws, message):
         """Handle incoming WebSocket messages"""
         try:
-            data = json.loads(message)
-            self.handle_message(data)
-        except json.JSONDecodeError as e:
-            print(f"❌ Error parsing message: {e}")
+            messages = [_json_loads(message)]
+        except ValueError:
+            # The server may coalesce several messages into one frame
+            try:
+                messages = list(_iter_documents(message))
+            except ValueError as e:
+                print(f"❌ Error parsing message: {e}")
+                return
+
+        for data in messages:
+            # A batch may also arrive as a single JSON array
+            if isinstance(data, list):
+                for item in data:
+                    self.handle_message(item)
+            else:
+                self.handle_message(data)
 
     def on_error(self, ws, error):
         """Handle WebSocket errors"""
@@ -102,23 +250,30 @@ class SysMedicInteractiveClient:
         if close_msg:
             print(f"   Message: {close_msg}")
         self.running = False
+        self._connect_done.set()
 
     def on_open(self, ws):
         """Handle WebSocket connection open"""
         print(f"✅ Connected to SysMedic at {self.host}:{self.port}")
         print("   Interactive mode ready! Type 'help' for available commands.")
         self.running = True
+        self._connect_done.set()
 
     def handle_message(self, message):
         """Process different types of messages from SysMedic"""
-        msg_type = message.get('type', 'unknown')
-        data = message.get('data', {})
-        timestamp = message.get('timestamp', '')
-        request_id = message.get('request_id')
-
-        # Handle responses to requests
-        if request_id and request_id in self.pending_requests:
-            request_info = self.pending_requests.pop(request_id)
+        get = message.get
+        msg_type, data, request_id = get('type', 'unknown'), get('data', {}), get('request_id')
+
+        # Keep buffered updates ordered before any other output
+        if msg_type != 'system_update':
+            self.flush_output()
+
+        # Handle responses to requests; IDs are sent as decimal strings
+        request_info = None
+        if request_id and request_id.isdecimal():
+            request_info = self.pending_requests.pop(int(request_id), None)
+
+        if request_info:
             elapsed = time.time() - request_info['timestamp']
 
             print(f"\n📥 Response for {request_info['type']} (took {elapsed:.2f}s):")
@@ -128,22 +283,21 @@ class SysMedicInteractiveClient:
             return
 
         # Handle regular messages
-        if msg_type == 'welcome':
-            print(f"🎉 {data.get('message', 'Welcome')} (Version: {data.get('version', 'unknown')})")
-
-        elif msg_type == 'system_update':
-            self.display_system_update(data)
-
-        elif msg_type == 'alert':
-            self.display_alert(data)
-
-        elif msg_type == 'error':
-            print(f"❌ Server Error: {data.get('error', 'Unknown error')}")
-
+        handler = self._handlers.get(msg_type)
+        if handler:
+            handler(data)
         else:
             print(f"📦 Unknown message type: {msg_type}")
             print(f"   Data: {json.dumps(data, indent=2)}")
 
+    def display_welcome(self, data):
+        """Display the server welcome message"""
+        print(f"🎉 {data.get('message', 'Welcome')} (Version: {data.get('version', 'unknown')})")
+
+    def display_error(self, data):
+        """Display an error reported by the server"""
+        print(f"❌ Server Error: {data.get('error', 'Unknown error')}")
+
     def display_response_data(self, response_type, data):
         """Display response data in a formatted way"""
         if response_type == 'system_info_response':
@@ -158,11 +312,14 @@ class SysMedicInteractiveClient:
                     print(f"   {key.replace('_', ' ').title()}: {value}")
 
         elif response_type == 'alerts_response':
+            try:
+                unresolved, total, status, recent = _alert_fields(data)
+            except KeyError:
+                unresolved, total, status, recent = _alert_fields({**_ALERT_DEFAULTS, **data})
             print("🚨 ALERTS INFORMATION:")
-            print(f"   Unresolved: {data.get('unresolved_count', 0)}")
-            print(f"   Total: {data.get('total_count', 0)}")
-            print(f"   Status: {data.get('status', 'Unknown')}")
-            recent = data.get('recent_alerts', [])
+            print(f"   Unresolved: {unresolved}")
+            print(f"   Total: {total}")
+            print(f"   Status: {status}")
             if recent:
                 print("   Recent Alerts:")
                 for alert in recent:
@@ -200,24 +357,50 @@ class SysMedicInteractiveClient:
 
     def display_system_update(self, data):
         """Display system metrics in a compact format"""
-        timestamp = time.strftime("%H:%M:%S")
-        cpu = data.get('cpu_usage', 0)
-        memory = data.get('memory_usage', 0)
-        disk = data.get('disk_usage', 0)
-        uptime = data.get('uptime', 'unknown')
-
-        # Create simple progress bars
-        cpu_bar = self.create_progress_bar(cpu)
-        memory_bar = self.create_progress_bar(memory)
-        disk_bar = self.create_progress_bar(disk)
-
-        print(f"📊 [{timestamp}] CPU: {cpu:5.1f}% {cpu_bar} | "
-              f"Memory: {memory:5.1f}% {memory_bar} | "
-              f"Disk: {disk:5.1f}% {disk_bar} | "
-              f"Uptime: {uptime}")
-
-    def create_progress_bar(self, percentage, width=10):
+        get = data.get
+        bar = self.create_progress_bar
+        cpu = get('cpu_usage', 0)
+        memory = get('memory_usage', 0)
+        disk = get('disk_usage', 0)
+
+        line = self._UPDATE_LINE % (
+            self.clock_text(),
+            cpu, bar(cpu),
+            memory, bar(memory),
+            disk, bar(disk),
+            get('uptime', 'unknown'),
+        )
+        with self._out_lock:
+            self._out_buf.append(line)
+            if len(self._out_buf) == 1:
+                # First line since the last flush: make sure it is written
+                # even if no further frame or keystroke arrives
+                timer = threading.Timer(self.OUTPUT_FLUSH_INTERVAL, self.flush_output)
+                timer.daemon = True
+                timer.start()
+
+    def flush_output(self):
+        """Write buffered system update lines with a single write"""
+        with self._out_lock:
+            lines, self._out_buf = self._out_buf, []
+            if lines:
+                sys.stdout.write(''.join(lines))
+                sys.stdout.flush()
+
+    def clock_text(self):
+        """Current local time as HH:MM:SS, formatted at most once a second"""
+        second = int(time.time())
+        if second != self._clock_second:
+            self._clock_second = second
+            self._clock_text = time.strftime("%H:%M:%S", time.localtime(second))
+        return self._clock_text
+
+    @classmethod
+    def create_progress_bar(cls, percentage, width=10):
         """Create a simple ASCII progress bar"""
+        if width == 10:
+            return cls._BARS[max(0, min(100, int(percentage))) // 10]
+
         filled = int((percentage / 100) * width)
         bar = "█" * filled + "░" * (width - filled)
         return f"[{bar}]"
@@ -240,6 +423,7 @@ class SysMedicInteractiveClient:
     def connect(self):
         """Connect to the WebSocket server"""
         print(f"🔄 Connecting to {self.ws_url}...")
+        self._connect_done.clear()
 
         self.ws = websocket.WebSocketApp(
             self.ws_url,
@@ -249,15 +433,17 @@ class SysMedicInteractiveClient:
             on_close=self.on_close
         )
 
-        # Start WebSocket connection in a separate thread
-        ws_thread = threading.Thread(target=self.ws.run_forever)
+        # Start WebSocket connection in a separate thread; frames arrive as bytes
+        ws_thread = threading.Thread(target=self.ws.run_forever, kwargs={
+            'skip_utf8_validation': True,
+            'ping_interval': 30,
+            'ping_timeout': 10,
+        })
         ws_thread.daemon = True
         ws_thread.start()
 
-        # Wait for connection
-        time.sleep(2)
-
-        if not self.running:
+        # Wait until the connection opens or fails
+        if not self._connect_done.wait(timeout=10) or not self.running:
             raise Exception("Failed to connect to WebSocket server")
 
         return ws_thread
@@ -271,7 +457,11 @@ class SysMedicInteractiveClient:
 
         while self.running:
             try:
-                command = input("\nsysmedic> ").strip().lower()
+                self.flush_output()
+                command = self.read_command("\nsysmedic> ")
+                if command is None:
+                    break
+                command = command.strip().lower()
 
                 if command == 'help' or command == 'h':
                     self.show_help()
@@ -306,6 +496,40 @@ class SysMedicInteractiveClient:
 
         self.disconnect()
 
+    def read_command(self, prompt):
+        """Read a line from stdin, flushing buffered updates while waiting
+
+        Returns None if the connection closes before a line is entered.
+        """
+        if sys.platform == 'win32':
+            # select() only works with sockets on Windows
+            return input(prompt)
+
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+
+        fd = sys.stdin.fileno()
+        # select() rather than DefaultSelector: epoll and kqueue refuse
+        # regular files and /dev/null, which stdin may be redirected from
+        with selectors.SelectSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while b'\n' not in self._stdin_buf:
+                if not selector.select(timeout=self.OUTPUT_FLUSH_INTERVAL):
+                    self.flush_output()
+                    if not self.running:
+                        return None
+                    continue
+
+                chunk = os.read(fd, 4096)
+                if not chunk:
+                    if not self._stdin_buf:
+                        raise EOFError
+                    break
+                self._stdin_buf += chunk
+
+        line, _, self._stdin_buf = self._stdin_buf.partition(b'\n')
+        return line.decode(errors='replace')
+
     def show_help(self):
         """Show available commands"""
         print("\n📋 Available Commands:")
@@ -334,6 +558,7 @@ class SysMedicInteractiveClient:
 
     def disconnect(self):
         """Disconnect from the WebSocket server"""
+        self.flush_output()
         if self.ws:
             print("\n🔌 Disconnecting...")
             self.running = False
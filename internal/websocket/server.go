@@ -27,6 +27,10 @@ var upgrader = websocket.Upgrader{
 	},
 	ReadBufferSize:  1024,
 	WriteBufferSize: 1024,
+
+	// Negotiate permessage-deflate (RFC 7692) with clients that offer it;
+	// the JSON frames compress well. Clients without support are unaffected.
+	EnableCompression: true,
 }
 
 const (
@@ -48,12 +52,36 @@ type Server struct {
 	secret   string
 	hostname string
 	mu       sync.RWMutex
-	clients  map[*websocket.Conn]bool
+	clients  map[*websocket.Conn]*client
 	running  bool
 	server   *http.Server
 	listener net.Listener
 }
 
+// client serializes writes to one connection. gorilla/websocket allows a
+// single concurrent writer, and the update loop, the request reader and
+// alert broadcasts all write to the same connection.
+type client struct {
+	conn    *websocket.Conn
+	writeMu sync.Mutex
+}
+
+// writeJSON sends v as one JSON text frame under the write lock
+func (c *client) writeJSON(v interface{}) error {
+	c.writeMu.Lock()
+	defer c.writeMu.Unlock()
+	c.conn.SetWriteDeadline(time.Now().Add(writeWait))
+	return c.conn.WriteJSON(v)
+}
+
+// writeMessage sends a single frame under the write lock
+func (c *client) writeMessage(messageType int, data []byte) error {
+	c.writeMu.Lock()
+	defer c.writeMu.Unlock()
+	c.conn.SetWriteDeadline(time.Now().Add(writeWait))
+	return c.conn.WriteMessage(messageType, data)
+}
+
 type Message struct {
 	Type      string      `json:"type"`
 	Data      interface{} `json:"data"`
@@ -77,7 +105,7 @@ func NewServer(port int) *Server {
 	return &Server{
 		port:     port,
 		hostname: hostname,
-		clients:  make(map[*websocket.Conn]bool),
+		clients:  make(map[*websocket.Conn]*client),
 	}
 }
 
@@ -92,7 +120,7 @@ func NewServerWithSecret(port int, secret string) *Server {
 		port:     port,
 		hostname: hostname,
 		secret:   secret,
-		clients:  make(map[*websocket.Conn]bool),
+		clients:  make(map[*websocket.Conn]*client),
 	}
 }
 
@@ -176,8 +204,10 @@ func (s *Server) handleWebSocket(w http.ResponseWriter, r *http.Request) {
 		return nil
 	})
 
+	c := &client{conn: conn}
+
 	s.mu.Lock()
-	s.clients[conn] = true
+	s.clients[conn] = c
 	clientCount := len(s.clients)
 	s.mu.Unlock()
 	defer s.removeClient(conn)
@@ -197,14 +227,13 @@ func (s *Server) handleWebSocket(w http.ResponseWriter, r *http.Request) {
 		},
 		"timestamp": time.Now().Format("2006-01-02T15:04:05Z"),
 	}
-	conn.SetWriteDeadline(time.Now().Add(writeWait))
-	if err := conn.WriteJSON(welcome); err != nil {
+	if err := c.writeJSON(welcome); err != nil {
 		log.Printf("Error sending welcome message: %v", err)
 		return
 	}
 
 	// Send configuration as YAML after welcome message
-	if err := s.sendConfigYAML(conn); err != nil {
+	if err := s.sendConfigYAML(c); err != nil {
 		log.Printf("Error sending config YAML: %v", err)
 		return
 	}
@@ -213,7 +242,7 @@ func (s *Server) handleWebSocket(w http.ResponseWriter, r *http.Request) {
 	done := make(chan struct{})
 
 	// Start message reader goroutine
-	go s.readPump(conn, done)
+	go s.readPump(c, done)
 
 	// Start sending periodic system updates every 3 seconds
 	dataTicker := time.NewTicker(3 * time.Second)
@@ -227,14 +256,12 @@ func (s *Server) handleWebSocket(w http.ResponseWriter, r *http.Request) {
 	for {
 		select {
 		case <-dataTicker.C:
-			conn.SetWriteDeadline(time.Now().Add(writeWait))
-			if err := s.sendSystemUpdate(conn); err != nil {
+			if err := s.sendSystemUpdate(c); err != nil {
 				log.Printf("Error sending system update: %v", err)
 				return
 			}
 		case <-pingTicker.C:
-			conn.SetWriteDeadline(time.Now().Add(writeWait))
-			if err := conn.WriteMessage(websocket.PingMessage, nil); err != nil {
+			if err := c.writeMessage(websocket.PingMessage, nil); err != nil {
 				log.Printf("Failed to send ping: %v", err)
 				return
 			}
@@ -265,12 +292,12 @@ func (s *Server) handleHealth(w http.ResponseWriter, r *http.Request) {
 		status["status"], status["running"], status["clients"], status["port"], status["hostname"], status["has_secret"])
 }
 
-func (s *Server) readPump(conn *websocket.Conn, done chan struct{}) {
+func (s *Server) readPump(c *client, done chan struct{}) {
 	defer close(done)
 
 	for {
 		var request ClientRequest
-		err := conn.ReadJSON(&request)
+		err := c.conn.ReadJSON(&request)
 		if err != nil {
 			if websocket.IsUnexpectedCloseError(err, websocket.CloseGoingAway, websocket.CloseAbnormalClosure) {
 				log.Printf("WebSocket error: %v", err)
@@ -280,33 +307,33 @@ func (s *Server) readPump(conn *websocket.Conn, done chan struct{}) {
 			return
 		}
 
-		s.processClientRequest(conn, request)
+		s.processClientRequest(c, request)
 	}
 }
 
-func (s *Server) processClientRequest(conn *websocket.Conn, request ClientRequest) {
+func (s *Server) processClientRequest(c *client, request ClientRequest) {
 	switch request.Type {
 	case "get_system_info":
-		s.sendSystemInfo(conn, request.RequestID)
+		s.sendSystemInfo(c, request.RequestID)
 	case "get_alerts":
-		s.sendAlerts(conn, request.RequestID)
+		s.sendAlerts(c, request.RequestID)
 	case "get_user_metrics":
-		s.sendUserMetrics(conn, request.RequestID)
+		s.sendUserMetrics(c, request.RequestID)
 	case "get_config":
-		s.sendConfig(conn, request.RequestID)
+		s.sendConfig(c, request.RequestID)
 	case "get_uptime":
-		s.sendUptime(conn, request.RequestID)
+		s.sendUptime(c, request.RequestID)
 	case "ping":
-		s.sendPong(conn, request.RequestID)
+		s.sendPong(c, request.RequestID)
 	default:
-		s.sendError(conn, request.RequestID, fmt.Sprintf("Unknown request type: %s", request.Type))
+		s.sendError(c, request.RequestID, fmt.Sprintf("Unknown request type: %s", request.Type))
 	}
 }
 
-func (s *Server) sendSystemInfo(conn *websocket.Conn, requestID string) {
+func (s *Server) sendSystemInfo(c *client, requestID string) {
 	metrics, err := s.getSystemMetrics()
 	if err != nil {
-		s.sendError(conn, requestID, fmt.Sprintf("Failed to get system metrics: %v", err))
+		s.sendError(c, requestID, fmt.Sprintf("Failed to get system metrics: %v", err))
 		return
 	}
 
@@ -316,10 +343,10 @@ func (s *Server) sendSystemInfo(conn *websocket.Conn, requestID string) {
 		Timestamp: time.Now(),
 		RequestID: requestID,
 	}
-	conn.WriteJSON(response)
+	c.writeJSON(response)
 }
 
-func (s *Server) sendAlerts(conn *websocket.Conn, requestID string) {
+func (s *Server) sendAlerts(c *client, requestID string) {
 	// This would integrate with the alerts system
 	alerts := map[string]interface{}{
 		"unresolved_count": 0,
@@ -334,10 +361,10 @@ func (s *Server) sendAlerts(conn *websocket.Conn, requestID string) {
 		Timestamp: time.Now(),
 		RequestID: requestID,
 	}
-	conn.WriteJSON(response)
+	c.writeJSON(response)
 }
 
-func (s *Server) sendUserMetrics(conn *websocket.Conn, requestID string) {
+func (s *Server) sendUserMetrics(c *client, requestID string) {
 	cfg, err := config.LoadConfig("")
 	if err != nil {
 		cfg = config.GetDefaultConfig()
@@ -346,7 +373,7 @@ func (s *Server) sendUserMetrics(conn *websocket.Conn, requestID string) {
 	mon := monitor.NewMonitor(cfg)
 	userMetrics, err := mon.GetUserMetrics()
 	if err != nil {
-		s.sendError(conn, requestID, fmt.Sprintf("Failed to get user metrics: %v", err))
+		s.sendError(c, requestID, fmt.Sprintf("Failed to get user metrics: %v", err))
 		return
 	}
 
@@ -356,13 +383,13 @@ func (s *Server) sendUserMetrics(conn *websocket.Conn, requestID string) {
 		Timestamp: time.Now(),
 		RequestID: requestID,
 	}
-	conn.WriteJSON(response)
+	c.writeJSON(response)
 }
 
-func (s *Server) sendConfig(conn *websocket.Conn, requestID string) {
+func (s *Server) sendConfig(c *client, requestID string) {
 	cfg, err := config.LoadConfig("")
 	if err != nil {
-		s.sendError(conn, requestID, fmt.Sprintf("Failed to load config: %v", err))
+		s.sendError(c, requestID, fmt.Sprintf("Failed to load config: %v", err))
 		return
 	}
 
@@ -380,11 +407,11 @@ func (s *Server) sendConfig(conn *websocket.Conn, requestID string) {
 		Timestamp: time.Now(),
 		RequestID: requestID,
 	}
-	conn.WriteJSON(response)
+	c.writeJSON(response)
 }
 
 // sendConfigYAML sends the current configuration as YAML data
-func (s *Server) sendConfigYAML(conn *websocket.Conn) error {
+func (s *Server) sendConfigYAML(c *client) error {
 	cfg, err := config.LoadConfig("")
 	if err != nil {
 		return fmt.Errorf("failed to load config: %v", err)
@@ -403,15 +430,14 @@ func (s *Server) sendConfigYAML(conn *websocket.Conn) error {
 		"timestamp": time.Now().Format("2006-01-02T15:04:05Z"),
 	}
 
-	conn.SetWriteDeadline(time.Now().Add(writeWait))
-	if err := conn.WriteJSON(configMessage); err != nil {
+	if err := c.writeJSON(configMessage); err != nil {
 		return fmt.Errorf("failed to send config message: %v", err)
 	}
 
 	return nil
 }
 
-func (s *Server) sendUptime(conn *websocket.Conn, requestID string) {
+func (s *Server) sendUptime(c *client, requestID string) {
 	uptime := getSystemUptime()
 
 	response := Message{
@@ -420,31 +446,30 @@ func (s *Server) sendUptime(conn *websocket.Conn, requestID string) {
 		Timestamp: time.Now(),
 		RequestID: requestID,
 	}
-	conn.WriteJSON(response)
+	c.writeJSON(response)
 }
 
-func (s *Server) sendPong(conn *websocket.Conn, requestID string) {
+func (s *Server) sendPong(c *client, requestID string) {
 	response := Message{
 		Type:      "pong",
 		Data:      map[string]interface{}{"message": "pong"},
 		Timestamp: time.Now(),
 		RequestID: requestID,
 	}
-	conn.SetWriteDeadline(time.Now().Add(writeWait))
-	conn.WriteJSON(response)
+	c.writeJSON(response)
 }
 
-func (s *Server) sendError(conn *websocket.Conn, requestID string, errorMsg string) {
+func (s *Server) sendError(c *client, requestID string, errorMsg string) {
 	response := Message{
 		Type:      "error",
 		Data:      map[string]interface{}{"error": errorMsg},
 		Timestamp: time.Now(),
 		RequestID: requestID,
 	}
-	conn.WriteJSON(response)
+	c.writeJSON(response)
 }
 
-func (s *Server) sendSystemUpdate(conn *websocket.Conn) error {
+func (s *Server) sendSystemUpdate(c *client) error {
 	// Get current system stats from monitor
 	metrics, err := s.getSystemMetrics()
 	if err != nil {
@@ -460,8 +485,7 @@ func (s *Server) sendSystemUpdate(conn *websocket.Conn) error {
 			},
 			"timestamp": time.Now().Format("2006-01-02T15:04:05Z"),
 		}
-		conn.SetWriteDeadline(time.Now().Add(writeWait))
-		return conn.WriteJSON(update)
+		return c.writeJSON(update)
 	}
 
 	update := map[string]interface{}{
@@ -475,15 +499,14 @@ func (s *Server) sendSystemUpdate(conn *websocket.Conn) error {
 		"timestamp": time.Now().Format("2006-01-02T15:04:05Z"),
 	}
 
-	conn.SetWriteDeadline(time.Now().Add(writeWait))
-	return conn.WriteJSON(update)
+	return c.writeJSON(update)
 }
 
 func (s *Server) removeClient(conn *websocket.Conn) {
 	s.mu.Lock()
 	defer s.mu.Unlock()
 
-	if s.clients[conn] {
+	if _, ok := s.clients[conn]; ok {
 		delete(s.clients, conn)
 		conn.Close()
 		log.Printf("Client disconnected. Total clients: %d", len(s.clients))
@@ -492,9 +515,9 @@ func (s *Server) removeClient(conn *websocket.Conn) {
 
 func (s *Server) BroadcastAlert(alertData interface{}) {
 	s.mu.RLock()
-	clients := make([]*websocket.Conn, 0, len(s.clients))
-	for conn := range s.clients {
-		clients = append(clients, conn)
+	clients := make([]*client, 0, len(s.clients))
+	for _, c := range s.clients {
+		clients = append(clients, c)
 	}
 	s.mu.RUnlock()
 
@@ -504,10 +527,10 @@ func (s *Server) BroadcastAlert(alertData interface{}) {
 		Timestamp: time.Now(),
 	}
 
-	for _, conn := range clients {
-		if err := conn.WriteJSON(message); err != nil {
+	for _, c := range clients {
+		if err := c.writeJSON(message); err != nil {
 			log.Printf("Error broadcasting alert: %v", err)
-			s.removeClient(conn)
+			s.removeClient(c.conn)
 		}
 	}
 }
@@ -524,7 +547,7 @@ func (s *Server) Stop() error {
 	for conn := range s.clients {
 		conn.Close()
 	}
-	s.clients = make(map[*websocket.Conn]bool)
+	s.clients = make(map[*websocket.Conn]*client)
 
 	// Close the server
 	if s.server != nil {